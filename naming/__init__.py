@@ -1,5 +1,6 @@
 import re
 from pathlib import Path
+from functools import lru_cache
 
 from .base import _BaseName, NameConfig
 
@@ -11,6 +12,25 @@ __all__ = [
     'NameConfig',
 ]
 
+# pipe field templates indexed by a bit mask of the missing fields: (output, version, index)
+# %-formatting is used since it's cheaper than str.format for these simple substitutions
+_PIPE_TEMPLATES = (
+    '%(sep)s%(output)s%(sep)s%(version)s%(sep)s%(index)s',
+    '%(sep)s%(output)s%(sep)s%(version)s',
+    '%(sep)s%(output)s%(sep)s{version}%(sep)s%(index)s',
+    '%(sep)s%(output)s%(sep)s{version}',
+    '%(sep)s{output}%(sep)s%(version)s%(sep)s%(index)s',
+    '%(sep)s%(version)s',  # optional output and index fields
+    '%(sep)s{output}%(sep)s{version}%(sep)s%(index)s',
+    '%(sep)s{pipe}',
+)
+
+
+@lru_cache(maxsize=64)
+def _pipe_placeholder(sep: str) -> str:
+    """The pipe field for names missing all pipe values, `sep` rarely changes so it's cached."""
+    return _PIPE_TEMPLATES[-1] % {'sep': sep}
+
 
 class Name(_BaseName):
     """Base class for name objects.
@@ -47,6 +67,7 @@ class Name(_BaseName):
         >>> n.base
         'through_field_name'
     """
+    __slots__ = ()
 
 
 class File(_BaseName):
@@ -82,14 +103,14 @@ class File(_BaseName):
         >>> f.path
         WindowsPath('hello.abc')
     """
+    __slots__ = ()
     file_config = NameConfig(dict(suffix=r'\w+'))
 
     @property
     def _pattern(self) -> str:
         sep = re.escape('.')
-        casted = self.cast_config(self.file_config)
-        pat = r'({sep}{suffix})'.format(sep=sep, **casted)
-        return rf'{super()._pattern}{pat}'
+        suffix = self.cast_config(self.file_config)['suffix']
+        return rf'{super()._pattern}(?:{sep}{suffix})'
 
     def get(self, **values) -> str:
         if not values and self.name:
@@ -104,7 +125,7 @@ class File(_BaseName):
     @property
     def path(self) -> Path:
         """A Path for this name object joining field names from `self.get_path_pattern_list` with this object's name"""
-        args = list(self._iter_translated_field_names(self.get_path_pattern_list()))
+        args = self._iter_translated_field_names(self.get_path_pattern_list())
         args.append(self.get())
         return Path(*args)
 
@@ -176,14 +197,15 @@ class Pipe(_BaseName):
         >>> p.values
         {'base': 'my_wip_data', 'pipe': '.exchange.7.101', 'output': 'exchange', 'version': '7', 'index': '101'}
     """
+    __slots__ = ()
     pipe_config = NameConfig(dict(pipe=r'\w+', output=r'\w+', version=r'\d+', index=r'\d+'))
 
     @property
     def _pattern(self):
         sep = re.escape(self.pipe_sep)
         casted = self.cast_config(self.pipe_config)
-        pat = r'(?P<pipe>({sep}{output})?{sep}{version}({sep}{index})?)'.format(sep=sep, **casted)
-        return rf'{super()._pattern}{pat}'
+        output, version, index = casted['output'], casted['version'], casted['index']
+        return rf'{super()._pattern}(?P<pipe>(?:{sep}{output})?{sep}{version}(?:{sep}{index})?)'
 
     @property
     def pipe_sep(self) -> str:
@@ -193,26 +215,24 @@ class Pipe(_BaseName):
     @property
     def pipe_name(self) -> str:
         """The pipe name string of this object."""
-        pipe_suffix = self.pipe or rf"{self.pipe_sep}{{pipe}}"
+        pipe_suffix = self._values.get('pipe') or _pipe_placeholder(self.pipe_sep)
         return rf'{self.nice_name}{pipe_suffix}'
 
-    def _format_pipe_field(self, k, v):
-        if k == 'index' and v is None:
-            return ''
-        return rf'{self.pipe_sep}{v if v is not None else rf"{{{k}}}"}'
-
     def _get_pipe_field(self, output=None, version=None, index=None) -> str:
-        fields = dict(output=output or None, version=version, index=index)
+        sep, values = self.pipe_sep, self._values
+        output = output or values.get('output')
         # comparisons to None due to 0 being a valid value
-        fields = {k: v if v is not None else self._values.get(k) for k, v in fields.items()}
+        if version is None:
+            version = values.get('version')
+        if index is None:
+            index = values.get('index')
 
-        if all(v is None for v in fields.values()):
-            suffix = rf'{self.pipe_sep}{{pipe}}'
-            return self.pipe or suffix if self.name else suffix
-        elif not fields['output'] and fields['index'] is None:  # optional fields
-            return rf'{self.pipe_sep}{fields["version"]}'
+        if version is None and output is None and index is None:  # version is the most commonly provided field
+            # values are empty when there's no name, so no need to check for it
+            return values.get('pipe') or _pipe_placeholder(sep)
 
-        return ''.join(self._format_pipe_field(k, v) for k, v in fields.items())
+        missing = (output is None) << 2 | (version is None) << 1 | (index is None)
+        return _PIPE_TEMPLATES[missing] % {'sep': sep, 'output': output, 'version': version, 'index': index}
 
     def get(self, **values) -> str:
         if not values and self.name:
@@ -221,9 +241,7 @@ class Pipe(_BaseName):
             # allow for getting name without pipe field in subclasses
             pipe = values['pipe'] or ''
         except KeyError:
-            kwargs = {k: values.get(k) for k in self.pipe_config}
-            kwargs.pop('pipe')
-            pipe = self._get_pipe_field(**kwargs)
+            pipe = self._get_pipe_field(values.get('output'), values.get('version'), values.get('index'))
         return rf'{super().get(**values)}{pipe}'
 
 
@@ -284,3 +302,4 @@ class PipeFile(File, Pipe):
         >>> pf.name
         'project_data_name   1907   christianl   constant   iamlast.data.17.abc'
     """
+    __slots__ = ()
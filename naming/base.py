@@ -1,15 +1,43 @@
 import re
+import sys
 import typing
 from itertools import chain
-from collections import ChainMap
+from collections import defaultdict, deque
+from functools import lru_cache
+from inspect import getattr_static
 from types import MappingProxyType
+from weakref import WeakKeyDictionary
 
 
-def _dct_from_mro(cls: type, attr_name: str) -> dict:
-    """Get a merged dictionary from `cls` bases attribute `attr_name`. MRO defines importance (closest = strongest)."""
+@lru_cache(maxsize=64)
+def _escape(value: str) -> str:
+    """Cached `re.escape`, separators are usually the same handful of strings."""
+    return re.escape(value)
+
+
+@lru_cache(maxsize=256)
+def _compile(pattern: str) -> re.Pattern:
+    """Cached `re.compile`, bounded since patterns may include instance dependent property values."""
+    return re.compile(pattern)
+
+
+def _iter_from_bases(cls: type, attr_name: str) -> typing.Generator:
+    """Yield attribute `attr_name` from `cls` bases (last = strongest), then `cls` own attribute.
+    Name bases have it merged already, other bases (e.g. mixins) are walked through their MRO."""
+    for base in reversed(cls.__bases__):
+        if issubclass(base, _BaseName):
+            yield getattr(base, attr_name, {})
+        else:
+            yield from (vars(c)[attr_name] for c in reversed(base.__mro__) if attr_name in vars(c))
+    yield vars(cls).get(attr_name, {})
+
+
+def _dct_from_bases(cls: type, attr_name: str) -> dict:
+    """Get a merged dictionary from `cls` attribute `attr_name` and its bases.
+    Bases order defines importance (first = strongest), with `cls` own attribute being the strongest."""
     d = {}
-    for c in reversed(cls.mro()):
-        d.update(getattr(c, attr_name, {}))
+    for value in _iter_from_bases(cls, attr_name):
+        d.update(value)
     return d
 
 
@@ -26,38 +54,59 @@ def _sorted_items(mapping: typing.Mapping) -> typing.Generator:
         foo ['bar']
         one ('hi', 'six', 'net')
         two ('two', 'one', 'foo')
+
+    :raises ValueError: If keys reference each other in a cycle.
     """
-    to_yield = set(mapping)
-    while to_yield:
-        for key, values in mapping.items():
-            if key not in to_yield or (to_yield - {key} & set(values)):  # other keys left to yield before this one
-                continue
-            yield key, values
-            to_yield.remove(key)
+    keys = mapping.keys()
+    pending = {}  # amount of other keys left to yield before each key
+    dependents = defaultdict(list)
+    for key, values in mapping.items():
+        references = keys & set(values)
+        references.discard(key)  # a key may reference itself when redefining a field to an outer scope
+        pending[key] = len(references)
+        for reference in references:
+            dependents[reference].append(key)
+
+    ready = deque(key for key, count in pending.items() if not count)
+    while ready:
+        key = ready.popleft()
+        yield key, mapping[key]
+        for dependent in dependents[key]:
+            pending[dependent] -= 1
+            if not pending[dependent]:
+                ready.append(dependent)
+
+    unsolved = [key for key, count in pending.items() if count]
+    if unsolved:
+        raise ValueError(f"Circular references found between keys: {unsolved}")
 
 
 class NameConfig:
+    __slots__ = ('cfg', 'name', 'memo')
+
     def __init__(self, cfg: typing.Mapping = None, name: str = None):
         if not isinstance(cfg, MappingProxyType):
             cfg = MappingProxyType(cfg or {})
         self.cfg = cfg
         self.name = name
-        self.memo = {}
+        self.memo = WeakKeyDictionary()  # shared descriptors should not keep subclasses alive
 
     def __get__(self, obj, objtype):
         cfg = self.cfg
         if obj is None:
             return cfg
-        # configs are immutable, so can cache here
-        result = self.memo.get(self.name) or {}
-        if self.name and isinstance(result, MappingProxyType):
-            return result
+        # configs and joins are immutable per class, so can cache here
+        cached = self.memo.get(objtype)
+        if cached is not None:
+            return cached
 
         # don't solve compound fields that are not related to the current config
         compounds = {k: v for k, v in objtype.join.items() if (k in cfg or set(v).intersection(cfg))}
         solved = dict()  # will not preserve order
-        pattern_lookup = ChainMap({}, solved, cfg)
-        for ck, cvs in _sorted_items(compounds):
+        pattern_lookup = dict(cfg)  # solved compounds are updated on top of the config patterns
+        for ck, cvs in objtype._sorted_join:
+            if ck not in compounds:
+                continue
             # cast the compound values to regex groups, named unless a value is equal to the current key `ck`
             # search first in `cfg`, then in the object for properties
             compound_fields = {cv: obj.cast(solved.pop(cv, pattern_lookup.get(cv, getattr(obj, cv))), cv if cv != ck else '') for cv in cvs}
@@ -65,7 +114,9 @@ class NameConfig:
             compound_fields[ck] = solved[ck] = compound_pattern
             pattern_lookup.update(compound_fields)
 
-        compounds_fields = set().union(*(v for v in compounds.values()))
+        # every config key referenced by a compound belongs to one of the related compounds above
+        compounds_fields = objtype._join_fields
+        result = {}
         for k, v in cfg.items():
             if k in compounds and k in solved:  # a compound may be nested. ensure it's also in the solved dict
                 result[k] = solved.pop(k)
@@ -75,11 +126,10 @@ class NameConfig:
                 result[k] = v
 
         # keep track of solved compounds that were not referenced by `cfg`
-        obj._uc = MappingProxyType(pattern_lookup)
-        objtype._uc = obj._uc
+        objtype._uc = MappingProxyType(pattern_lookup)
 
         result = MappingProxyType(result)
-        self.memo[self.name] = result
+        self.memo[objtype] = result
         return result
 
     def __set__(self, obj, val):
@@ -92,6 +142,8 @@ class NameConfig:
 
 
 class FieldValue:
+    __slots__ = ('name',)
+
     def __init__(self, name):
         self.name = name
 
@@ -101,41 +153,47 @@ class FieldValue:
         return obj._values.get(self.name)
 
     def __set__(self, obj, val):
-        if val and str(val) == obj._values.get(self.name):
-            return
-        new_name = obj.get(**{self.name: val})
-        try:
-            obj.name = new_name
-        except ValueError:
-            if self.name in obj.config:
-                pattern = obj.config[self.name]
-                msg = (rf"Can't set field '{self.name}' with invalid value '{val}' on '{obj!r}'. "
-                       rf"A valid field value should match pattern: '{pattern}'")
-                raise ValueError(msg)
-            else:
-                raise
+        obj._set_one(self.name, val)
 
 
 class _BaseName:
     """This is the base abstract class for Name objects. You should not need to create instances of this class."""
+    __slots__ = ('_name', '_values', '_memo', '_separator', '_separator_pattern', '_regex', '__fullmatch')
     config = dict()
     drop = tuple()
     join = dict()
     join_sep = ''
+    _join_fields = frozenset()
+    _join_refs = frozenset()
+    _sorted_join = tuple()
+    _fields = frozenset()
+    _joined_patterns = dict()
 
     def __init_subclass__(cls, **kwargs):
-        cls.join = MappingProxyType(_dct_from_mro(cls, 'join'))
-        cls.drop = frozenset(chain.from_iterable(getattr(c, 'drop', tuple()) for c in cls.mro()))
-
-        cfg = _dct_from_mro(cls, 'config')
-        for drop in cls.drop:
-            cfg.pop(drop, None)
-            setattr(cls, drop, None)
+        # field names are used as keys on every name build, interned strings make those lookups cheaper
+        join = _dct_from_bases(cls, 'join')
+        cls.join = MappingProxyType({sys.intern(k): tuple(map(sys.intern, v)) for k, v in join.items()})
+        cls._join_fields = frozenset(chain.from_iterable(cls.join.values()))
+        cls._join_refs = cls._join_fields.union(cls.join)
+        cls._sorted_join = tuple(_sorted_items(cls.join))
+        cls._joined_patterns = dict()
+        cls.drop = frozenset(chain.from_iterable(_iter_from_bases(cls, 'drop')))
+
+        drop = cls.drop
+        cfg = {sys.intern(k): v for k, v in _dct_from_bases(cls, 'config').items() if k not in drop}
+        for k in drop:
+            setattr(cls, k, None)
 
         # fields in compounds and name config descriptors have to be accessible through their name on instances.
         configs = (nc.cfg for nc in vars(cls).values() if isinstance(nc, NameConfig))
-        for k in set().union(cfg, cls.join, *configs):
+        keys = set(chain(cfg, cls.join, *configs))
+        for k in keys:
             setattr(cls, k, FieldValue(k))
+        # names resolved by a FieldValue, their values can be read straight from `_values`
+        inherited = (getattr(base, '_fields', tuple()) for base in cls.__bases__)
+        cls._fields = frozenset(
+            k for k in chain(keys, *inherited) if isinstance(getattr_static(cls, k), FieldValue)
+        )
 
         cls.config = NameConfig(cfg, 'config')
 
@@ -143,18 +201,23 @@ class _BaseName:
         super().__init__()
         self._name = ''
         self._values = {}
-        self._items = self._values.items()
+        self._memo = {}  # values derived from the current name and separator
         self._set_separator(sep)
         self._init_name_core(name)
 
     def _init_name_core(self, name: str):
         """Runs whenever a new instance is initialized or `sep` is set."""
-        self.__regex = re.compile(rf'^{self._pattern}$')
+        # pattern lists and property fields may vary between instances, so the pattern is built for each of them
+        # and only the compiled regexes are shared between instances with the same pattern
+        # the bound `fullmatch` is kept next to the pattern to save an attribute lookup on every name set
+        self._regex = regex = _compile(self._pattern)
+        self.__fullmatch = regex.fullmatch
         self.name = name
 
     def _set_separator(self, value: str):
-        self._separator = rf'{value}' if value else ''
-        self._separator_pattern = re.escape(self._separator)
+        self._separator = str(value) if value else ''
+        self._separator_pattern = _escape(self._separator)
+        self._memo.clear()
 
     @property
     def sep(self) -> str:
@@ -164,7 +227,7 @@ class _BaseName:
     @sep.setter
     def sep(self, value: str):
         self._set_separator(value)
-        name = self.get(**self.values) if self.name else None
+        name = self.get(**self._filtered_values()) if self.name else None
         self._init_name_core(name)
 
     @property
@@ -177,19 +240,18 @@ class _BaseName:
 
     @name.setter
     def name(self, name: str):
-        name = rf'{name}' if name else ''
+        name = str(name) if name else ''
+        if name == self._name:
+            return
         if name:
-            match = self.__regex.match(name)
+            match = self.__fullmatch(name)
             if not match:
-                proxy = self.__class__(sep=self._separator)
-                pat = self.__regex.pattern
-                msg = (rf"Can't set invalid name '{name}' on {self!r}. "
-                       rf"Valid convention is: '{proxy.get()}' with pattern: '{pat}'")
-                raise ValueError(msg)
+                raise ValueError(self._invalid_name_message(name))
             self._values.update(match.groupdict())
         else:
             self._values.clear()
         self._name = name
+        self._memo.clear()
 
     @property
     def _pattern(self) -> str:
@@ -199,9 +261,20 @@ class _BaseName:
                    'Got: {} instead'.format(pattern_list))
             raise ValueError(msg)
 
-        cfg = self.config
-        casted = (self.cast(self._uc.get(p, getattr(self, p)), p) for p in self.get_pattern_list())
-        return self._separator_pattern.join(casted)
+        # patterns made only of config and compound fields don't depend on the instance, so they're kept per class
+        key = (self._separator_pattern, tuple(pattern_list))
+        try:
+            return self._joined_patterns[key]
+        except KeyError:
+            pass
+        self.config  # solve the config first so joined fields not referenced by it are available on `_uc`
+        uc, fields, field_values = self._uc, self._fields, self._values
+        casted = [self.cast(uc.get(p, field_values.get(p) if p in fields else getattr(self, p)), p)
+                  for p in pattern_list]
+        pattern = self._separator_pattern.join(casted)
+        if all(p in uc for p in pattern_list):
+            self._joined_patterns[key] = pattern
+        return pattern
 
     def get_pattern_list(self) -> typing.List[str]:
         """Fields / properties names (sorted) to be used when building names. Defaults to the keys of self.config"""
@@ -210,7 +283,15 @@ class _BaseName:
     @property
     def values(self) -> typing.Dict[str, str]:
         """The field values of this object's name as a dictionary in the form of {field: value}."""
-        return {k: v for k, v in self._items if v is not None}
+        return self._filtered_values().copy()
+
+    def _filtered_values(self) -> typing.Dict[str, str]:
+        memo = self._memo
+        try:
+            return memo['values']
+        except KeyError:
+            values = memo['values'] = {k: v for k, v in self._values.items() if v is not None}
+            return values
 
     @property
     def nice_name(self) -> str:
@@ -226,25 +307,57 @@ class _BaseName:
         :param values: Variable keyword arguments where the **key** should refer to a field on this object that will
                        use the provided **value** to build the new name.
         """
-        if not values and self.name:
+        if not values:
             # no overridden field values to set, can return existing name string
-            return self.name
-        if values:
+            return self._name or self._get_nice_name()
+        if self._sorted_join and not self._join_refs.isdisjoint(values):
             # if values are provided, solve compounds that may be affected
-            for ck, cvs in _sorted_items(self.join):
+            for ck, cvs in self._sorted_join:
                 if ck in cvs and ck in values:  # redefined compound name to outer scope e.g. fifth = (fifth, sixth)
                     continue
                 if values.get(ck):
                     # compound key has been provided in values
                     continue
+                if ck not in values and values.keys().isdisjoint(cvs):
+                    # none of the compound values changed, so its current value holds (and is not joined again)
+                    continue
                 comp_values = [values.pop(cv, getattr(self, cv)) for cv in cvs]
                 if None not in comp_values:
                     # only if the full compound values are complete, we join and use it
-                    values[ck] = self.join_sep.join(rf'{v}' for v in comp_values)
+                    values[ck] = self.join_sep.join([str(v) for v in comp_values])
         return self._get_nice_name(**values)
 
-    def _iter_translated_field_names(self, names: typing.Iterable[str], **values) -> typing.Generator:
-        return (rf'{values[n]}' if n in values else getattr(self, n) or rf'{{{n}}}' for n in names)
+    def _set_one(self, name: str, value):
+        """Set a single field `name` to `value`, rebuilding this object's name."""
+        if value is not None and str(value) == self._values.get(name):  # 0 is a valid value
+            return
+        # field patterns may depend on their neighbours (e.g. lookarounds), so they are validated with the whole name
+        new_name = self.get(**{name: value})
+        try:
+            self.name = new_name
+        except ValueError:
+            if name in self.config:
+                raise ValueError(self._invalid_field_message(name, value))
+            else:
+                raise
+
+    def _invalid_name_message(self, name: str) -> str:
+        proxy = self.__class__(sep=self._separator)
+        return (rf"Can't set invalid name '{name}' on {self!r}. "
+                rf"Valid convention is: '{proxy.get()}' with pattern: '{self._regex.pattern}'")
+
+    def _invalid_field_message(self, name: str, value) -> str:
+        pattern = self.config[name]
+        return (rf"Can't set field '{name}' with invalid value '{value}' on '{self!r}'. "
+                rf"A valid field value should match pattern: '{pattern}'")
+
+    def _iter_translated_field_names(self, names: typing.Iterable[str], **values) -> typing.List[str]:
+        # a list lets str.join size the result in a single pass
+        fields, field_values = self._fields, self._values
+        return [
+            str(values[n]) if n in values else (field_values.get(n) if n in fields else getattr(self, n)) or rf'{{{n}}}'
+            for n in names
+        ]
 
     @staticmethod
     def cast(value: str, name: str = '') -> str:
@@ -256,6 +369,25 @@ class _BaseName:
         """Cast `config` to grouped regular expressions."""
         return {k: cls.cast(v, k) for k, v in config.items()}
 
+    @classmethod
+    def parse_many(cls, names: typing.Iterable[str], sep: str = ' ') -> typing.List[typing.Dict[str, str]]:
+        """Get the field values of each of `names` without creating an object per name.
+
+        :param names: Name strings following this convention.
+        :param sep: The separator used by all `names`.
+        :raises ValueError: If any of `names` is invalid for this convention.
+        """
+        proxy = cls(sep=sep)
+        fullmatch = proxy._regex.fullmatch
+        result = []
+        for name in names:
+            name = str(name)
+            match = fullmatch(name)
+            if not match:
+                raise ValueError(proxy._invalid_name_message(name))
+            result.append({k: v for k, v in match.groupdict().items() if v is not None})
+        return result
+
     def __str__(self):
         return self.get()
 
@@ -1,2 +0,0 @@
-import setuptools
-setuptools.setup()
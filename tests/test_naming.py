@@ -1,25 +1,144 @@
+import gc
 import unittest
+import weakref
+from unittest import mock
 from pathlib import Path
 
 import naming
 
 
 class Name(naming.Name):
+    __slots__ = ()
     config = dict(base=r'\w+')
 
 
 class Pipe(naming.Pipe):
+    __slots__ = ()
     config = dict(base=r'\w+')
 
 
 class File(naming.File):
+    __slots__ = ()
     config = dict(base=r'\w+')
 
 
 class PipeFile(File, Pipe):
+    __slots__ = ()
+
+
+_EXTRA = dict(year='[0-9]{4}', username='[a-z]+', anotherfield='(constant)', lastfield='[a-zA-Z0-9]+')
+Project = type('Project', (Name,), dict(config=_EXTRA))
+ProjectFile = type('ProjectFile', (PipeFile,), dict(config=_EXTRA))
+SubPipe = type('SubPipe', (Pipe,), dict(config=dict(second=r'\w+')))
+Dropper = type('Dropper', (PipeFile,), dict(config=dict(without=r'[a-zA-Z0-9]+', basename=r'[a-zA-Z0-9]+'),
+                                            drop=('base',)))
+Subdropper = type('Dropper', (Dropper,), dict(config=dict(subdrop=r'[\w]')))
+Compound = type('Compound', (PipeFile,), dict(config=dict(first=r'[\d]+', second=r'[a-zA-Z]+'),
+                                              join=dict(base=('first', 'second'))))
+
+
+class CompUnused(Name):
+    config = dict(first='1',
+                  second='2')
+    join = dict(cmp=('first', 'second'))
+
+
+class CompUsed(CompUnused):
+    def get_pattern_list(self):
+        return ['cmp'] + super().get_pattern_list()
+
+
+class CompAndPropsInvalid(CompUnused):
+    # by compounding 'base', get_pattern_list will return an empty list, should fail to initialise
+    join = dict(cmp2=('base', 'prop'))
+
+    @property
+    def prop(self):
+        return 'constant'
+
+
+class CompAndPropsValid(CompAndPropsInvalid):
+    def get_pattern_list(self):
+        return ['cmp', 'cmp2']
+
+
+class PropertyField(PipeFile):
+    config = dict(extrafield='[a-z0-9]+')
+
+    @property
+    def nameprop(self):
+        return 'staticvalue'
+
+    @property
+    def pathprop(self):
+        return 'propertyfield'
+
+    def get_path_pattern_list(self):
+        result = super().get_pattern_list()
+        result.append('pathprop')
+        return result
+
+    def get_pattern_list(self):
+        result = super().get_pattern_list()
+        result.append('nameprop')
+        return result
+
+
+class RepeatName(Name):
+    # field pattern referencing another group, only valid as part of the whole name
+    config = dict(rep=r'(?P=base)')
+
+
+class ConfigMixin:
+    config = dict(first='1st')
+    drop = ('second',)
+
+
+class SubConfigMixin(ConfigMixin):
+    config = dict(second='2nd', third='3rd')
+
+
+class MixedName(SubConfigMixin, Name):
     pass
 
 
+class LookbehindName(Name):
+    # field pattern depending on the separator before it
+    config = dict(base='[a-z]+', tail=r'(?<=_)[xy]')
+
+
+class RootFile(File):
+    # property field depending on instance state other than the name
+    __slots__ = ('root',)
+
+    def __init__(self, *args, root='a', **kwargs):
+        self.root = root
+        super().__init__(*args, **kwargs)
+
+    @property
+    def folder(self):
+        return self.root
+
+    def get_path_pattern_list(self):
+        return ['folder']
+
+    def get_pattern_list(self):
+        return super().get_pattern_list() + ['folder']
+
+
+class ModeName(Name):
+    # pattern list varies per instance
+    __slots__ = ('mode',)
+    config = dict(aa='aa', bb='bb')
+
+    def __init__(self, *args, mode='aa', **kwargs):
+        self.mode = mode
+        super().__init__(*args, **kwargs)
+
+    def get_pattern_list(self):
+        return ['base', self.mode] if self.mode else []
+
+
 class FrameRange(naming.File):
     config = dict.fromkeys(
         ('high', 'low', 'minimum', 'maximum'), r'\d{1,2}'
@@ -46,8 +165,12 @@ class SubFrameRange(FrameRange):
 
 class TestName(unittest.TestCase):
 
+    @classmethod
+    def setUpClass(cls):
+        cls.name = Name()
+
     def test_empty_name(self):
-        n = Name()
+        n = self.name
         self.assertEqual('{base}', n.get())
         self.assertEqual('{base}', str(n))
 
@@ -67,6 +190,11 @@ class TestName(unittest.TestCase):
     def test_class_field_access(self):
         self.assertEqual(Name.base, None)
 
+    def test_slots(self):
+        for cls in Name, Pipe, File, PipeFile:
+            with self.subTest(cls=cls.__name__):
+                self.assertFalse(hasattr(cls(), '__dict__'))
+
 
 class TestConfig(unittest.TestCase):
 
@@ -82,22 +210,22 @@ class TestConfig(unittest.TestCase):
 
 class TestEasyName(unittest.TestCase):
 
+    @classmethod
+    def setUpClass(cls):
+        cls.name = Name()
+
     def test_empty_name(self):
-        n = Name()
+        n = self.name
         self.assertEqual('{base}', n.get())
         self.assertEqual({}, n.values)
 
     def test_new_empty_name(self):
-        extra_fields = dict(year='[0-9]{4}', username='[a-z]+', anotherfield='(constant)', lastfield='[a-zA-Z0-9]+')
-        Project = type('Project', (Name,), dict(config=extra_fields))
         p = Project(sep='_')
         self.assertEqual('{base}_{year}_{username}_{anotherfield}_{lastfield}', p.get())
         p.name = 'this_is_my_base_name_2017_christianl_constant_iamlast'
         self.assertEqual('2017', p.year)
 
     def test_separator(self):
-        extra_fields = dict(year='[0-9]{4}', username='[a-z]+', anotherfield='(constant)', lastfield='[a-zA-Z0-9]+')
-        Project = type('Project', (Name,), dict(config=extra_fields))
         p = Project('this_is_my_base_name_2017_christianl_constant_iamlast', sep='_')
         self.assertEqual('_', p.sep)
         p.sep = '  '
@@ -105,30 +233,38 @@ class TestEasyName(unittest.TestCase):
 
 
 class TestPipe(unittest.TestCase):
+    # (values, expected) pairs for names built from an empty Pipe
+    empty_name_cases = (
+        (dict(), '{base}.{pipe}'),
+        (dict(version=10), '{base}.10'),
+        (dict(version=10, output='geo'), '{base}.geo.10'),
+        (dict(version=10, output='geo', index=25), '{base}.geo.10.25'),
+        (dict(version=10, index=25), '{base}.{output}.10.25'),
+        (dict(index=101), '{base}.{output}.{version}.101'),
+        (dict(output='cache'), '{base}.cache.{version}'),
+        (dict(pipe=None), '{base}'),
+    )
+
+    @classmethod
+    def setUpClass(cls):
+        # shared empty instance, tests changing its separator must restore it
+        cls.pipe = Pipe()
+
+    def _assert_empty_name(self, p):
+        for values, expected in self.empty_name_cases:
+            with self.subTest(**values):
+                self.assertEqual(expected, p.get(**values))
 
     def test_empty_name(self):
-        p = Pipe()
-        self.assertEqual('{base}.{pipe}', p.get())
-        self.assertEqual('{base}.10', p.get(version=10))
-        self.assertEqual('{base}.geo.10', p.get(version=10, output='geo'))
-        self.assertEqual('{base}.geo.10.25', p.get(version=10, output='geo', index=25))
-        self.assertEqual('{base}.{output}.10.25', p.get(version=10, index=25))
-        self.assertEqual('{base}.{output}.{version}.101', p.get(index=101))
-        self.assertEqual('{base}.cache.{version}', p.get(output='cache'))
-        self.assertEqual('{base}', p.get(pipe=None))
+        self._assert_empty_name(self.pipe)
 
     def test_empty_name_separator(self):
-        p = Pipe()
+        p = self.pipe
+        self.addCleanup(setattr, p, 'sep', p.sep)
         for sep in ' ', '.', '/', '/ .':
-            p.sep = sep
-            self.assertEqual('{base}.{pipe}', p.get())
-            self.assertEqual('{base}.10', p.get(version=10))
-            self.assertEqual('{base}.geo.10', p.get(version=10, output='geo'))
-            self.assertEqual('{base}.geo.10.25', p.get(version=10, output='geo', index=25))
-            self.assertEqual('{base}.{output}.10.25', p.get(version=10, index=25))
-            self.assertEqual('{base}.{output}.{version}.101', p.get(index=101))
-            self.assertEqual('{base}.cache.{version}', p.get(output='cache'))
-            self.assertEqual('{base}', p.get(pipe=None))
+            with self.subTest(sep=sep):
+                p.sep = sep
+                self._assert_empty_name(p)
 
     def test_init_name(self):
         p = Pipe('initname.pipeline.0')
@@ -162,14 +298,23 @@ class TestPipe(unittest.TestCase):
         p.name = 'setname.pipeline.0.5'
         self.assertEqual('5', p.index)
         self.assertEqual('setname', p.nice_name)
+        self.assertEqual('setname.pipeline.0.5', p.pipe_name)
+        p.base = 'renamed'
+        self.assertEqual('renamed', p.nice_name)
+        self.assertEqual('renamed.pipeline.0.5', p.pipe_name)
 
     def test_values(self):
         p = Pipe()
         p.name = 'my_pipe_file.1'
         self.assertEqual({'base': 'my_pipe_file', 'version': '1', 'pipe': '.1'}, p.values)
+        # values are cached until the name changes, callers get their own copy
+        p.values['base'] = 'changed'
+        self.assertEqual('my_pipe_file', p.values['base'])
+        p.version = 2
+        self.assertEqual({'base': 'my_pipe_file', 'version': '2', 'pipe': '.2'}, p.values)
 
     def test_get_empty_name(self):
-        p = Pipe()
+        p = self.pipe
         self.assertEqual('{base}.{pipe}', p.pipe_name)
         self.assertEqual('{base}.{pipe}', p.get())
         self.assertEqual('{base}.out.7', p.get(pipe='.out.7'))
@@ -177,6 +322,24 @@ class TestPipe(unittest.TestCase):
         self.assertEqual('{base}.7', p.get(version=7))
         self.assertEqual('{base}.{output}.{version}.101', p.get(index=101))
 
+    def test_pattern_cache(self):
+        # compiled patterns are shared by instances with the same pattern
+        p1, p2 = SubPipe('first second.1'), SubPipe('other name.2')
+        self.assertIs(p1._regex, p2._regex)
+        p2.sep = '_'
+        self.assertIsNot(p1._regex, p2._regex)
+        self.assertIs(p2._regex, SubPipe(sep='_')._regex)
+
+    def test_parse_many(self):
+        names = ['first.1', 'second.geo.2', 'third.geo.3.101']
+        self.assertEqual([Pipe(n).values for n in names], Pipe.parse_many(names))
+        self.assertEqual([], Pipe.parse_many([]))
+        with self.assertRaises(ValueError):
+            Pipe.parse_many(['valid.1', 'invalid'])
+        with self.assertRaises(ValueError):
+            Pipe.parse_many([''])
+        self.assertEqual([{'base': 'a', 'version': '1', 'pipe': '.1'}], Pipe.parse_many([Path('a.1')]))
+
     def test_get_init_name(self):
         p = Pipe('my_pipe_file.7')
         self.assertEqual('my_pipe_file.{output}.7.101', p.get(index=101))
@@ -196,6 +359,8 @@ class TestFile(unittest.TestCase):
         self.assertEqual('ext', f.suffix)
         self.assertEqual('myfile', f.base)
         self.assertEqual(f.get(), str(f.path))
+        f.suffix = 'abc'
+        self.assertEqual(Path('myfile.abc'), f.path)
 
 
 class TestPipeFile(unittest.TestCase):
@@ -234,11 +399,13 @@ class TestPipeFile(unittest.TestCase):
         self.assertEqual('my_pipe_file.geometry.17.abc', p.name)
         p.version = 0
         self.assertEqual('my_pipe_file.geometry.0.abc', p.name)
+        # setting a falsy value equal to the current one returns early, without building a new name
+        with mock.patch.object(PipeFile, 'get') as get:
+            p.version = 0
+        get.assert_not_called()
         self.assertEqual('PipeFile("my_pipe_file.geometry.0.abc")', repr(p))
 
     def test_set_name(self):
-        extra_fields = dict(year='[0-9]{4}', username='[a-z]+', anotherfield='(constant)', lastfield='[a-zA-Z0-9]+')
-        ProjectFile = type('ProjectFile', (PipeFile,), dict(config=extra_fields))
         pf = ProjectFile('this_is_my_base_name_2017_christianl_constant_iamlast.base.17.abc', sep='_')
         self.assertEqual('this_is_my_base_name_2017_christianl_constant_iamlast', pf.nice_name)
         self.assertEqual('this_is_my_base_name_2017_christianl_constant_iamlast.base.17', pf.pipe_name)
@@ -264,17 +431,19 @@ class TestPipeFile(unittest.TestCase):
 
 class TestDrops(unittest.TestCase):
 
+    @classmethod
+    def setUpClass(cls):
+        cls.dropper = Dropper(sep='_')
+        cls.subdropper = Subdropper(sep='_')
+
     def test_empty_name(self):
-        Dropper = type('Dropper', (PipeFile,), dict(config=dict(without=r'[a-zA-Z0-9]+', basename=r'[a-zA-Z0-9]+'),
-                                                    drop=('base',)))
-        d = Dropper(sep='_')
+        d = self.dropper
         self.assertEqual('{without}_{basename}.{pipe}.{suffix}', d.get())
         self.assertEqual('awesome_{basename}.{pipe}.{suffix}', d.get(without='awesome'))
         self.assertEqual('{without}_replaced.{output}.{version}.101.{suffix}',
                          d.get(basename='replaced', index=101))
 
-        Subdropper = type('Dropper', (Dropper,), dict(config=dict(subdrop='[\w]')))
-        s = Subdropper(sep='_')
+        s = self.subdropper
         self.assertEqual('{without}_{basename}_{subdrop}.{pipe}.{suffix}', s.get())
         self.assertEqual('awesome_{basename}_{subdrop}.{pipe}.{suffix}', s.get(without='awesome'))
         self.assertEqual('{without}_replaced_{subdrop}.{output}.{version}.101.{suffix}',
@@ -284,8 +453,6 @@ class TestDrops(unittest.TestCase):
 class TestCompound(unittest.TestCase):
 
     def test_empty_name(self):
-        Compound = type('Compound', (PipeFile,), dict(config=dict(first=r'[\d]+', second=r'[a-zA-Z]+'),
-                                                      join=dict(base=('first', 'second'))))
         c = Compound(sep='_')
         self.assertEqual('{base}.{pipe}.{suffix}', c.get())
         self.assertEqual('{base}.{pipe}.{suffix}', c.get(first=50))
@@ -298,27 +465,6 @@ class TestCompound(unittest.TestCase):
             c.values)
         self.assertEqual('200dalmatians.1.png', c.get(first=200))
 
-        class CompUnused(Name):
-            config = dict(first='1',
-                          second='2')
-            join = dict(cmp=('first', 'second'))
-
-        class CompUsed(CompUnused):
-            def get_pattern_list(self):
-                return ['cmp'] + super().get_pattern_list()
-
-        class CompAndPropsInvalid(CompUnused):
-            # by compounding 'base', get_pattern_list will return an empty list, should fail to initialise
-            join = dict(cmp2=('base', 'prop'))
-
-            @property
-            def prop(self):
-                return 'constant'
-
-        class CompAndPropsValid(CompAndPropsInvalid):
-            def get_pattern_list(self):
-                return ['cmp', 'cmp2']
-
         c = CompUnused()
         self.assertEqual('{base}', c.get())
         c.name = 'hello_world'
@@ -347,31 +493,16 @@ class TestCompound(unittest.TestCase):
                           'prop': 'constant',
                           'second': '2'}, c.values)
 
+    def test_circular_join(self):
+        with self.assertRaises(ValueError):
+            class Circular(Name):
+                config = dict(first='1', second='2')
+                join = dict(first=('second', 'base'), second=('first', 'base'))
+
 
 class TestPropertyField(unittest.TestCase):
 
     def test_empty_name(self):
-        class PropertyField(PipeFile):
-            config = dict(extrafield='[a-z0-9]+')
-
-            @property
-            def nameprop(self):
-                return 'staticvalue'
-
-            @property
-            def pathprop(self):
-                return 'propertyfield'
-
-            def get_path_pattern_list(self):
-                result = super().get_pattern_list()
-                result.append('pathprop')
-                return result
-
-            def get_pattern_list(self):
-                result = super().get_pattern_list()
-                result.append('nameprop')
-                return result
-
         pf = PropertyField(sep='_')
         self.assertEqual(Path('{base}/{extrafield}/propertyfield/{base}_{extrafield}_staticvalue.{pipe}.{suffix}'),
                          pf.path)
@@ -382,6 +513,22 @@ class TestPropertyField(unittest.TestCase):
         self.assertEqual('simple_property_staticvalue', pf.nice_name)
         self.assertEqual(Path('simple/property/propertyfield/simple_property_staticvalue.1.abc'), pf.path)
 
+    def test_instance_state(self):
+        f = RootFile('x a.txt')
+        self.assertEqual(Path('a/x a.txt'), f.path)
+        # patterns built from property values are not shared with other instances
+        self.assertEqual(Path('b/x b.txt'), RootFile('x b.txt', root='b').path)
+        self.assertEqual('x a', f.nice_name)
+        f.root = 'b'
+        self.assertEqual(Path('b/x a.txt'), f.path)
+        self.assertEqual('x b', f.nice_name)
+        f = RootFile()
+        self.assertEqual('{base} a.{suffix}', str(f))
+        self.assertEqual(Path('a/{base} a.{suffix}'), f.path)
+        f.root = 'b'
+        self.assertEqual('{base} b.{suffix}', str(f))
+        self.assertEqual(Path('b/{base} b.{suffix}'), f.path)
+
 
 class TestSubclassing(unittest.TestCase):
     SubName = type('SubName', (Name,), dict(config=dict(base=r'\w+', second_field='(2nd)', third_field='(3rd)')))
@@ -413,6 +560,7 @@ class TestSubclassing(unittest.TestCase):
         self.assertEqual('{base} {second_field} {third_field}', n.get())
         n.sep = 'p'
         self.assertEqual('p', n.sep)
+        self.assertEqual('{base}p{second_field}p{third_field}', n.get())
         self.assertEqual('hellop{second_field}p{third_field}', n.get(base='hello'))
         self.assertEqual({}, n.values)
         newname = n.get(base='hello', second_field='2nd', third_field='3r')
@@ -423,8 +571,13 @@ class TestSubclassing(unittest.TestCase):
         n.sep = '?'
         self.assertEqual('hello?2nd?3rd', n.name)
         self.assertEqual('sups?2nd?3rd', n.get(base='sups'))
+        regex = n._regex
         n.sep = '?*&'
         self.assertEqual('hello?*&2nd?*&3rd', n.name)
+        # separators already seen by the class reuse their compiled pattern
+        n.sep = '?'
+        self.assertIs(regex, n._regex)
+        self.assertEqual('hello?2nd?3rd', n.name)
 
     def test_config_only(self):
         n = self.SubName()
@@ -476,6 +629,9 @@ class TestSubclassing(unittest.TestCase):
         self.assertEqual('3rd', n.third_field)
         self.assertEqual('5thlast', n.fifth_field)
         self.assertEqual('last', n.lastfield)
+        # fields unrelated to compounds should leave compound values untouched
+        self.assertEqual('s1sts2nd3rd 5thlast x f2', n.get(f1='x'))
+        self.assertEqual('s1sts2nd3rd 5thlast x f2', n.get(f1='x', third_field='3rd'))
         with self.assertRaises(ValueError):
             n.base = 'repls'
         n = self.Subcoms2()
@@ -495,6 +651,41 @@ class TestSubclassing(unittest.TestCase):
             self.SubName3('mrb dos 3r')
         self.assertEqual('masnombres', n.morename)
 
+    def test_contextual_field_patterns(self):
+        n = RepeatName('ab ab')
+        self.assertEqual('ab', n.rep)
+        with self.assertRaises(ValueError):
+            n.rep = 'cd'
+        self.assertEqual('ab ab', n.name)
+        n = LookbehindName('ab_x', sep='_')
+        n.tail = 'y'
+        self.assertEqual('ab_y', n.name)
+        with self.assertRaises(ValueError):
+            n.tail = 'z'
+
+    def test_instance_pattern_list(self):
+        self.assertEqual({'base': 'foo', 'bb': 'bb'}, ModeName('foo bb', mode='bb').values)
+        self.assertEqual({'base': 'foo', 'aa': 'aa'}, ModeName('foo aa', mode='aa').values)
+        with self.assertRaises(ValueError):
+            ModeName('foo aa', mode='bb')
+        # pattern lists are validated by every instance, even when other ones compiled their pattern already
+        with self.assertRaises(ValueError):
+            ModeName(mode='')
+
+    def test_garbage_collection(self):
+        # solved configs are memoized per class without keeping dynamically created classes alive
+        cls = type('Temporary', (PipeFile,), dict(config=dict(extra=r'\w+')))
+        cls().get()
+        ref = weakref.ref(cls)
+        del cls
+        gc.collect()
+        self.assertIsNone(ref())
+
+    def test_mixins(self):
+        # config, join and drop from plain mixins are merged through their whole hierarchy
+        self.assertEqual('{base} {first} {third}', MixedName().get())
+        self.assertEqual(None, MixedName.second)
+
     def test_compounds(self):
         class ComplicatedCompound(Name):
             config = dict(one='1st', two='2nd', three='3rd', four='4th', five='5th', six='6th', seven='7th',